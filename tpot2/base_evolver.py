@@ -16,7 +16,7 @@ from tqdm.dask import TqdmCallback
 import distributed
 from dask.distributed import Client
 from dask.distributed import LocalCluster
-from tpot2.parent_selectors import survival_select_NSGA2, TournamentSelection_Dominated
+from tpot2.parent_selectors import survival_select_NSGA2, TournamentSelection_Dominated, _dominates_threshold
 import math
 from tpot2.utils import get_thresholds, beta_interpolation, remove_items, equalize_list, update_pareto_frontier
 
@@ -206,6 +206,7 @@ class BaseEvolver():
         self.bigger_is_better = bigger_is_better
         if not bigger_is_better:
             self.objective_function_weights = np.array(self.objective_function_weights)*-1
+        self.objective_function_signs = np.sign(self.objective_function_weights) #memoized, the weights never change after init
 
         self.initial_population_size = initial_population_size
         if self.initial_population_size is None:
@@ -410,8 +411,8 @@ class BaseEvolver():
                 #update the pareto frontier
                 self.population.evaluated_individuals = update_pareto_frontier(self.population.evaluated_individuals, self.objective_names, self.objective_function_weights,self.generation-1)
 
-                if self.verbose >= 3:  
-                    sign = np.sign(self.objective_function_weights)
+                if self.verbose >= 3:
+                    sign = self.objective_function_signs
                     valid_df = self.population.evaluated_individuals[~self.population.evaluated_individuals[self.objective_names].isin(["TIMEOUT","INVALID"]).any(axis=1)][self.objective_names]*sign
                     cur_best_scores = valid_df.max(axis=0)*sign
                     cur_best_scores = cur_best_scores.to_numpy()
@@ -423,7 +424,7 @@ class BaseEvolver():
                 if self.early_stop:
                     if self.budget is None or self.budget>=self.budget_range[-1]: #self.budget>=1:
                         #get sign of objective_function_weights
-                        sign = np.sign(self.objective_function_weights)
+                        sign = self.objective_function_signs
                         #get best score for each objective
                         valid_df = self.population.evaluated_individuals[~self.population.evaluated_individuals[self.objective_names].isin(["TIMEOUT","INVALID"]).any(axis=1)][self.objective_names]*sign
                         cur_best_scores = valid_df.max(axis=0)*sign
@@ -654,8 +655,13 @@ class BaseEvolver():
 
         ################
 
-        objective_function_signs = np.sign(self.objective_function_weights)
+        objective_function_signs = self.objective_function_signs.astype(np.float64)
 
+        #pick the score reduction once instead of re-checking the strategy string every step
+        if self.final_score_strategy == 'mean':
+            reduce_scores = lambda s: s.mean(axis=0)
+        else: #'last'
+            reduce_scores = lambda s: s[-1]
 
         cur_individuals = self.population.population.copy()
         
@@ -730,10 +736,7 @@ class BaseEvolver():
             #array of shape (steps, individuals, objectives)
             offspring_scores = [self.population.get_column(cur_individuals, column_names=step_names) for step_names in all_step_names]
             offspring_scores = np.array(offspring_scores)
-            if self.final_score_strategy == 'mean':
-                offspring_scores  = offspring_scores.mean(axis=0)
-            elif self.final_score_strategy == 'last':
-                offspring_scores = offspring_scores[-1]
+            offspring_scores = reduce_scores(offspring_scores)
 
 
             #if last step, add the final metrics
@@ -747,11 +750,11 @@ class BaseEvolver():
             if self.n_jobs < len(cur_individuals):
                 #Remove based on thresholds
                 if thresholds is not None:
-                    threshold = thresholds[step]
+                    threshold = np.asarray(thresholds[step], dtype=np.float64)
                     invalids = []
                     for i in range(len(offspring_scores)):
 
-                        if all([s*w>t*w for s,t,w in zip(offspring_scores[i],threshold,objective_function_signs)  ]):
+                        if _dominates_threshold(np.asarray(offspring_scores[i], dtype=np.float64), threshold, objective_function_signs):
                             invalids.append(i)
 
                     if len(invalids) > 0:
@@ -1,21 +1,34 @@
 import types
+import sys
+import hashlib
+import contextlib
 from abc import abstractmethod
 import numpy as np
-from joblib import Parallel, delayed
 import traceback
-from collections.abc import Iterable
+import logging
+from collections import OrderedDict
 import warnings
-from stopit import threading_timeoutable, TimeoutException
 from tpot2.parent_selectors import survival_select_NSGA2
 import time
+import weakref
+import multiprocessing
+import multiprocessing.pool
+import pickle
+import signal
+import threading
 import dask
-import stopit
 from dask.diagnostics import ProgressBar
 from tqdm.dask import TqdmCallback
 from dask.distributed import progress
 
 import func_timeout
 
+#failed evaluations also go through this logger with lazy %-formatting, so the
+#message and traceback are only materialized when a DEBUG handler is attached
+#and users can redirect diagnostics without raising verbosity
+logger = logging.getLogger(__name__)
+
+
 def process_scores(scores, n):
     '''
     Purpose: This function processes a list of scores to ensure that each score list has the same length, n. If a score list is shorter than n, the function fills the list with either "TIMEOUT" or "INVALID" values.
@@ -30,53 +43,402 @@ def process_scores(scores, n):
         The scores list, after processing.
     
     '''
+    #prebuild the pad rows once instead of a fresh list comprehension per short row
+    timeout_row = ("TIMEOUT",)*n
+    invalid_row = ("INVALID",)*n
     for i in range(len(scores)):
         if len(scores[i]) < n:
-            if "TIMEOUT" in scores[i]:
-                scores[i] = ["TIMEOUT" for j in range(n)]
-            else:
-                scores[i] = ["INVALID" for j in range(n)]
+            scores[i] = list(timeout_row) if "TIMEOUT" in scores[i] else list(invalid_row)
     return scores
 
 
-def objective_nan_wrapper(  individual, 
+def _pipeline_key(individual):
+    '''
+    Hashable key identifying the pipeline an individual evaluates to, not the individual
+    object itself, so cosmetically different genotypes that export the same estimator
+    classes and hyperparameters share cache entries.
+
+    Individual classes that implement a structural unique_id() (e.g. GraphIndividual's
+    GraphKey) already provide this and their key is used directly. For individuals that
+    fall back to identity (BaseIndividual.unique_id returns self), the exported pipeline
+    is hashed instead: estimator class names plus sorted get_params() reprs, digested
+    with blake2b so key computation stays cheap relative to evaluation.
+    '''
+    key = individual.unique_id()
+    if key is not individual:
+        return key
+    try:
+        pipeline = individual.export_pipeline()
+        steps = getattr(pipeline, 'steps', None)
+        if steps is not None:
+            estimators = [est for _, est in steps]
+        else:
+            estimators = [pipeline]
+        description = repr([(type(est).__name__, sorted((k, repr(v)) for k, v in est.get_params(deep=True).items())) for est in estimators])
+        return hashlib.blake2b(description.encode(), digest_size=16).hexdigest()
+    except Exception:
+        return key
+
+
+class _ObjectIdKey:
+    '''
+    Hashable identity wrapper for unhashable cache-key components (arrays, frames).
+    Holds a weak reference where possible so cache entries can't keep datasets alive:
+    once the referent is collected the key never matches again and the stale entry
+    simply ages out of the LRU. The id() is captured at construction so the hash
+    stays stable, and a dead referent can't be aliased by a recycled id() because
+    equality requires a live referent on both sides.
+    '''
+    __slots__ = ('_ref', '_id')
+    def __init__(self, obj):
+        self._id = id(obj)
+        try:
+            self._ref = weakref.ref(obj)
+        except TypeError:
+            self._ref = lambda obj=obj: obj #not weakrefable, keep it alive instead
+    def __hash__(self):
+        return self._id
+    def __eq__(self, other):
+        if not isinstance(other, _ObjectIdKey):
+            return False
+        obj = self._ref()
+        return obj is not None and obj is other._ref()
+
+
+#per-process LRU cache of single-objective results keyed on (pipeline, objective, kwargs).
+#finer grained than a whole-score-vector cache: a pipeline re-scored with a different
+#objective mix, budget or step still reuses the per-objective results it already has.
+_OBJ_CACHE = OrderedDict()
+_OBJ_CACHE_MAXSIZE = 100_000
+
+def _objective_cache_key(individual, objective_function, objective_kwargs):
+    extras = []
+    for name in sorted(objective_kwargs):
+        if name == 'generation': #bookkeeping only, does not affect scores
+            continue
+        value = objective_kwargs[name]
+        if isinstance(value, (int, float, str, bool, type(None))):
+            extras.append((name, value))
+        else: #X, y, etc. compared by identity so a new dataset can never alias an old entry
+            extras.append((name, _ObjectIdKey(value)))
+    return (_pipeline_key(individual), objective_function, tuple(extras))
+
+
+#the common scalar returns, checked by type before falling back to a __len__ probe.
+#avoids the collections.abc.Iterable subclasshook walk on every evaluation.
+_SCALAR_TYPES = (float, int, np.floating, np.integer)
+
+#warnings are only ever shown at high verbosity, but catch_warnings(record=True) still
+#snapshots and restores the filter list on every single evaluation. inside dask worker
+#processes we instead install an ignore filter once and skip the context manager
+#entirely; in the user's own process (the serial path) the global filter list belongs
+#to them, so a plain suppressing context is used per call instead.
+_warnings_silenced = False
+
+def _silence_worker_warnings_once():
+    '''
+    Installs a process-wide ignore filter if this is a dask worker process and returns
+    True; returns False without touching the filter list anywhere else.
+    '''
+    global _warnings_silenced
+    if _warnings_silenced:
+        return True
+    try:
+        dask.distributed.get_worker()
+    except Exception:
+        return False
+    warnings.simplefilter("ignore")
+    _warnings_silenced = True
+    return True
+
+@contextlib.contextmanager
+def _suppressed_warnings():
+    #yields an empty list so `len(w)` works the same as the record=True context
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        yield []
+
+def _quiet_warning_ctx():
+    if _silence_worker_warnings_once():
+        return contextlib.nullcontext([])
+    return _suppressed_warnings()
+
+
+#single-worker process pool used to enforce evaluation timeouts. thread-based timeouts
+#(func_timeout) cannot stop CPU-bound sklearn/BLAS code, so a timed-out evaluation keeps
+#burning CPU until it finishes. a process can actually be killed. created lazily, one per
+#(dask worker) process.
+_timeout_pool = None
+_timeout_pool_unavailable = False
+
+def _ignore_child_warnings():
+    #the child doesn't inherit the parent's warning filters, so evaluations there
+    #would print e.g. ConvergenceWarnings that are silenced everywhere else
+    warnings.simplefilter("ignore")
+
+def _get_timeout_pool():
+    global _timeout_pool, _timeout_pool_unavailable
+    if _timeout_pool is None and not _timeout_pool_unavailable:
+        try:
+            _timeout_pool = multiprocessing.get_context("spawn").Pool(1, initializer=_ignore_child_warnings)
+        except Exception: #e.g. daemonic processes cannot have children
+            _timeout_pool_unavailable = True
+    return _timeout_pool
+
+#per-function picklability verdicts so the pickle probe runs once per objective,
+#not once per evaluation. weak keys so the table can't keep objectives alive.
+_picklable_objectives = weakref.WeakKeyDictionary()
+
+def _objective_is_picklable(objective_function):
+    try:
+        return _picklable_objectives[objective_function]
+    except (KeyError, TypeError):
+        pass
+    try:
+        pickle.dumps(objective_function)
+        verdict = True
+    except Exception: #lambdas, closures over unpicklable state, ...
+        verdict = False
+    try:
+        _picklable_objectives[objective_function] = verdict
+    except TypeError:
+        pass #not weakrefable, just re-probe next time
+    return verdict
+
+def _call_with_timeout(objective_function, individual, timeout, objective_kwargs):
+    '''
+    Calls objective_function(individual, **objective_kwargs) with a hard timeout.
+    Prefers running in a separate process so a timed-out evaluation can be terminated;
+    falls back to the thread-based func_timeout when the objective cannot be pickled
+    (e.g. lambdas) or no child process can be created. Which path to take is decided
+    upfront by probing pickle.dumps on the objective, so exceptions the objective
+    raises in the child propagate instead of silently retrying the evaluation.
+    Raises func_timeout.exceptions.FunctionTimedOut on timeout either way.
+    '''
+    global _timeout_pool
+    if _objective_is_picklable(objective_function):
+        pool = _get_timeout_pool()
+        if pool is not None:
+            result = pool.apply_async(objective_function, (individual,), objective_kwargs)
+            try:
+                return result.get(timeout)
+            except multiprocessing.TimeoutError:
+                #the child is still running; kill it so the CPU is actually freed
+                pool.terminate()
+                _timeout_pool = None
+                raise func_timeout.exceptions.FunctionTimedOut("", timeout, objective_function, [individual], objective_kwargs)
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                #an exception the objective raised in the child carries a
+                #RemoteTraceback cause and must propagate to the INVALID handling.
+                #without one the individual or a kwarg failed to pickle on
+                #submission, the evaluation never ran, so fall through to the
+                #thread-based timeout instead of failing an evaluable pipeline
+                if isinstance(e.__cause__, multiprocessing.pool.RemoteTraceback):
+                    raise
+    return func_timeout.func_timeout(timeout, objective_function, args=[individual], kwargs=objective_kwargs)
+
+
+def objective_nan_wrapper(  individual,
                             objective_function,
                             verbose=0,
                             timeout=None,
+                            cache=None,
                             **objective_kwargs):
-    with warnings.catch_warnings(record=True) as w:  #catches all warnings in w so it can be supressed by verbose                
+    #thin single-objective wrapper over the fused loop so the cache layers, timeout
+    #dispatch and warnings handling live in exactly one place
+    values = _eval_all_objectives(individual, [objective_function], verbose=verbose,
+                                  timeout=timeout, cache=cache, **objective_kwargs)
+    return values[0]
+
+
+
+def _eval_all_objectives(ind, objective_list, verbose=0, timeout=None, cache=None, early_stop_thresholds=None, objective_function_weights=None, **objective_kwargs):
+    '''
+    Fused evaluation loop: sets up the warnings context and exception handling once for
+    the whole objective list instead of once per objective in objective_nan_wrapper.
+    Returns the list of per-objective result vectors. On the first timeout or exception
+    the row is cut short with a TIMEOUT/INVALID slot and the remaining objectives are
+    skipped; callers pad short rows to the expected width.
+    '''
+    if verbose >= 4:
+        warning_ctx = warnings.catch_warnings(record=True) #catches all warnings in w so they can be re-emitted
+    else:
+        warning_ctx = _quiet_warning_ctx()
+
+    values = []
+    pos = 0 #flat column index, used for the early-stop thresholds
+    with warning_ctx as w:
         try:
-            
-            if timeout is None:
-                value = objective_function(individual, **objective_kwargs)
-            else:
-                value = func_timeout.func_timeout(timeout, objective_function, args=[individual], kwargs=objective_kwargs)
-            
-            if not isinstance(value, Iterable):
-                value = [value]               
+            for objective_function in objective_list:
+                #same two cache layers as objective_nan_wrapper
+                if cache is not None:
+                    cache_key = (_pipeline_key(ind), objective_function)
+                    if cache_key in cache:
+                        value = cache[cache_key]
+                        values.append(value)
+                        pos += len(value)
+                        continue
+                obj_cache_key = _objective_cache_key(ind, objective_function, objective_kwargs)
+                cached_value = _OBJ_CACHE.get(obj_cache_key)
+                if cached_value is not None:
+                    _OBJ_CACHE.move_to_end(obj_cache_key)
+                    values.append(cached_value)
+                    pos += len(cached_value)
+                    continue
+
+                if timeout is None:
+                    value = objective_function(ind, **objective_kwargs)
+                else:
+                    value = _call_with_timeout(objective_function, ind, timeout, objective_kwargs)
+
+                if isinstance(value, _SCALAR_TYPES):
+                    value = (value,)
+                elif not hasattr(value, '__len__'):
+                    value = [value]
+
+                if cache is not None:
+                    cache[cache_key] = value
+                _OBJ_CACHE[obj_cache_key] = value
+                if len(_OBJ_CACHE) > _OBJ_CACHE_MAXSIZE:
+                    _OBJ_CACHE.popitem(last=False)
+                values.append(value)
+
+                #short-circuit at the objective level: once a score falls below its threshold
+                #(in the weighted direction) skip the remaining, typically more expensive,
+                #objectives. works best with objective_list ordered cheapest first.
+                if early_stop_thresholds is not None and objective_function_weights is not None:
+                    below_threshold = False
+                    for s in value:
+                        weight = objective_function_weights[pos]
+                        threshold = early_stop_thresholds[pos]
+                        if not isinstance(s, str) and weight*s < weight*threshold:
+                            below_threshold = True
+                        pos += 1
+                    if below_threshold and pos < len(early_stop_thresholds):
+                        values.append(["INVALID"]*(len(early_stop_thresholds)-pos))
+                        break
+                else:
+                    pos += len(value)
 
             if len(w) and verbose>=4:
-                
                 warnings.warn(w[0].message)
-            return value
         except func_timeout.exceptions.FunctionTimedOut:
+            logger.debug('individual timed out after %s seconds: %r', timeout, ind)
             if verbose >= 4:
-                print(f'WARNING AN INDIVIDUAL TIMED OUT: \n {individual} \n')
-            return ["TIMEOUT"]
+                print(f'WARNING AN INDIVIDUAL TIMED OUT: \n {ind} \n')
+            values.append(["TIMEOUT"])
         except Exception as e:
+            logger.debug('individual raised during evaluation: %r', ind, exc_info=True)
             if verbose == 4:
-                print(f'WARNING THIS INDIVIDUAL CAUSED AND EXCEPTION \n {individual} \n {e} \n')
+                print(f'WARNING THIS INDIVIDUAL CAUSED AND EXCEPTION \n {ind} \n {e} \n')
             if verbose >= 5:
                 trace = traceback.format_exc()
-                print(f'WARNING THIS INDIVIDUAL CAUSED AND EXCEPTION \n {individual} \n {e} \n {trace}')
-            return ["INVALID"]
-        
+                print(f'WARNING THIS INDIVIDUAL CAUSED AND EXCEPTION \n {ind} \n {e} \n {trace}')
+            values.append(["INVALID"])
+    return values
 
-def eval_objective_list(ind, objective_list, verbose=0,**objective_kwargs):
 
-    scores = np.concatenate([objective_nan_wrapper(ind, obj, verbose,**objective_kwargs) for obj in objective_list ])
+def eval_objective_list(ind, objective_list, verbose=0, cache=None, early_stop_thresholds=None, objective_function_weights=None, **objective_kwargs):
+
+    values = _eval_all_objectives(ind, objective_list, verbose=verbose, cache=cache,
+                                  early_stop_thresholds=early_stop_thresholds,
+                                  objective_function_weights=objective_function_weights,
+                                  **objective_kwargs)
+    #fill a preallocated buffer instead of np.concatenate to avoid an extra allocation+copy per individual.
+    #dtype=object because TIMEOUT/INVALID strings can appear alongside floats.
+    scores = np.empty(sum(len(v) for v in values), dtype=object)
+    pos = 0
+    for v in values:
+        scores[pos:pos+len(v)] = v
+        pos += len(v)
     return scores
 
+def _eval_chunk(individual_chunk, objective_list, verbose=0, timeout=None, **objective_kwargs):
+    #evaluates a chunk of individuals in a single task to amortize scheduler overhead
+    return [eval_objective_list(ind, objective_list, verbose, timeout=timeout, **objective_kwargs) for ind in individual_chunk]
+
+
+#gathered copies of pre-scattered kwargs, keyed on the future's key. Future.result()
+#returns a fresh copy on every call, so gathering inline would hand the identity-keyed
+#_OBJ_CACHE a brand new object (and a never-hitting cache entry) each generation;
+#reusing one gathered copy per future keeps the keys stable and the data shared.
+_gathered_futures_cache = OrderedDict()
+_GATHERED_CACHE_MAXSIZE = 16
+
+def _gather_kwarg_futures(objective_kwargs):
+    out = {}
+    for name, value in objective_kwargs.items():
+        if isinstance(value, dask.distributed.Future):
+            cached = _gathered_futures_cache.get(value.key)
+            if cached is None:
+                cached = value.result()
+                _gathered_futures_cache[value.key] = cached
+                while len(_gathered_futures_cache) > _GATHERED_CACHE_MAXSIZE:
+                    _gathered_futures_cache.popitem(last=False)
+            else:
+                _gathered_futures_cache.move_to_end(value.key)
+            out[name] = cached
+        else:
+            out[name] = value
+    return out
+
+
+_HEAVY_ARG_MIN_BYTES = 1_048_576 #1 MiB
+
+def _is_heavy(value):
+    #futures are already on the workers, only raw arrays/frames are worth scattering
+    if isinstance(value, dask.distributed.Future):
+        return False
+    nbytes = getattr(value, 'nbytes', None)
+    if nbytes is None:
+        nbytes = getattr(getattr(value, 'values', None), 'nbytes', None)
+    if nbytes is None:
+        try:
+            nbytes = sys.getsizeof(value)
+        except TypeError:
+            return False
+    return nbytes > _HEAVY_ARG_MIN_BYTES
+
+
+#maps (id(client), id(value)) -> (ref to value, scattered future) so heavy kwargs (X, y,
+#cv splits, ...) and the objective list are serialized to the cluster once and then
+#reused across generations. weakrefable values drop out when they are collected;
+#non-weakrefable values (lists, dicts) must be pinned so their id() stays valid, so the
+#registry is LRU-bounded to keep those entries from pinning futures forever
+_scattered_args_cache = OrderedDict()
+_SCATTER_CACHE_MAXSIZE = 64
+
+def _scatter_once(client, value):
+    '''
+    Scatters value to the cluster once per client and returns its future, reusing the
+    cached future on later calls with the same object.
+    '''
+    cache_key = (id(client), id(value))
+    entry = _scattered_args_cache.get(cache_key)
+    if entry is not None and entry[0]() is value:
+        _scattered_args_cache.move_to_end(cache_key)
+        return entry[1]
+    #wrap in a single-element list so client.scatter doesn't unpack list values
+    future = client.scatter([value], broadcast=True, hash=False)[0]
+    try:
+        ref = weakref.ref(value)
+    except TypeError:
+        ref = lambda value=value: value #not weakrefable, keep it alive so id() stays valid
+    _scattered_args_cache[cache_key] = (ref, future)
+    while len(_scattered_args_cache) > _SCATTER_CACHE_MAXSIZE:
+        _scattered_args_cache.popitem(last=False)
+    return future
+
+def _scatter_heavy_kwargs(client, objective_kwargs):
+    #evict entries whose original value was garbage collected so the registry can't grow
+    #without bound and a recycled id() can't alias a dead entry
+    dead_keys = [key for key, (ref, future) in _scattered_args_cache.items() if ref() is None]
+    for key in dead_keys:
+        del _scattered_args_cache[key]
+
+    return {name: _scatter_once(client, value) if _is_heavy(value) else value for name, value in objective_kwargs.items()}
+
+
 def parallel_eval_objective_list(individual_list,
                                 objective_list,
                                 n_jobs = 1,
@@ -85,51 +447,133 @@ def parallel_eval_objective_list(individual_list,
                                 n_expected_columns=None,
                                 client=None,
                                 parallel_timeout=None,
+                                cache=None,
+                                scheduler=None,
                                 **objective_kwargs):
 
     #offspring_scores = Parallel(n_jobs=n_jobs)(delayed(eval_objective_list)(ind,  objective_list, verbose, timeout=timeout)  for ind in individual_list )
-    
+
     # delayed_values = [dask.delayed(eval_objective_list)(ind,  objective_list, verbose, timeout=timeout,**objective_kwargs)  for ind in individual_list]
     # with TqdmCallback(desc="Evaluating Individuals", disable=verbose<2, leave=False):
     #     offspring_scores = list(dask.compute( *delayed_values,
     #                             num_workers=n_jobs))
     # del delayed_values
-    if client is None:
-        client = dask.distributed.get_client()
-    futures = [client.submit(eval_objective_list, ind,  objective_list, verbose, timeout=timeout,**objective_kwargs)  for ind in individual_list]
-    
-    if verbose >= 6:
-        dask.distributed.progress(futures, notebook=False)
-    
-    try: 
+
+    #functional equivalence cache: only submit individuals whose scores are not already known.
+    #the cache stays on the client side so it is never shipped to workers.
+    if cache is not None:
+        keys = [_pipeline_key(ind) for ind in individual_list]
+        seen_keys = set()
+        uncached_indexes = []
+        for i, key in enumerate(keys):
+            if key not in cache and key not in seen_keys:
+                uncached_indexes.append(i)
+                seen_keys.add(key)
+        individuals_to_submit = [individual_list[i] for i in uncached_indexes]
+    else:
+        individuals_to_submit = individual_list
+
+    if scheduler is not None:
+        #run on a local dask scheduler ('threads', 'processes', 'synchronous') without a
+        #distributed client. these are flat independent tasks with nothing to fuse, so
+        #skip the graph optimization pass as well.
+        objective_kwargs = _gather_kwarg_futures(objective_kwargs)
+        delayed_values = [dask.delayed(eval_objective_list)(ind, objective_list, verbose, timeout=timeout, **objective_kwargs) for ind in individuals_to_submit]
+        with TqdmCallback(desc="Evaluating Individuals", disable=verbose<2, leave=False):
+            submitted_scores = list(dask.compute(*delayed_values, num_workers=n_jobs, optimize_graph=False, scheduler=scheduler))
+    elif n_jobs == 1 or len(individuals_to_submit) < 4:
+        #serial fast path: with one worker or a handful of individuals the dask
+        #graph/scheduler overhead outweighs any parallelism, so evaluate in-process.
+        #kwargs that were pre-scattered as futures are gathered back first, one copy
+        #per future so repeated generations share the same objects.
+        objective_kwargs = _gather_kwarg_futures(objective_kwargs)
         if parallel_timeout is not None and np.isinf(parallel_timeout):
             parallel_timeout = None
-        dask.distributed.wait(futures, timeout=parallel_timeout)
-    except dask.distributed.TimeoutError:
-        print("terminating parallel evaluation due to timeout")
-        pass
-    
-    offspring_scores = []
-    # todo optimize this
-    for individual, future in zip(individual_list, futures):
-        if not future.done():
-            future.cancel()
-            offspring_scores.append(["TIMEOUT"])
-            if verbose >= 4:
-                print(f'WARNING AN INDIVIDUAL TIMED OUT: \n {individual} \n')
-        elif future.exception():
-            offspring_scores.append(["INVALID"])
-            if verbose == 4:
-                print(f'WARNING THIS INDIVIDUAL CAUSED AND EXCEPTION \n {individual} \n {future.exception()} \n')
-            if verbose >= 5:
-                trace = traceback.format_exc()
-                print(f'WARNING THIS INDIVIDUAL CAUSED AND EXCEPTION \n {individual} \n {future.exception()} \n {future.traceback()}')
-        else:
-            offspring_scores.append(future.result())
-            
+        deadline = None if parallel_timeout is None else time.time() + parallel_timeout
+        submitted_scores = []
+        for i, ind in enumerate(individuals_to_submit):
+            if deadline is not None and time.time() > deadline:
+                #same behavior as the distributed wait timing out: the rest of the
+                #generation is marked TIMEOUT so max_time_seconds is still honored
+                print("terminating parallel evaluation due to timeout")
+                submitted_scores.extend([["TIMEOUT"]]*(len(individuals_to_submit)-i))
+                if verbose >= 4:
+                    for individual in individuals_to_submit[i:]:
+                        print(f'WARNING AN INDIVIDUAL TIMED OUT: \n {individual} \n')
+                break
+            submitted_scores.append(eval_objective_list(ind, objective_list, verbose, timeout=timeout, **objective_kwargs))
+    else:
+        if client is None:
+            client = dask.distributed.get_client()
+
+        #scatter large arrays (X, y, ...) once instead of re-serializing them into every task
+        objective_kwargs = _scatter_heavy_kwargs(client, objective_kwargs)
+
+        #group individuals into chunks so each task does enough work to amortize the ~1ms scheduler overhead per task
+        batch_size = max(1, len(individuals_to_submit) // (n_jobs * 4))
+        chunks = [individuals_to_submit[i:i+batch_size] for i in range(0, len(individuals_to_submit), batch_size)]
+        #ship the objective list (scorers, closures over CV objects) to each worker once
+        #instead of re-pickling it into every task of every generation
+        futures = client.map(_eval_chunk, chunks, objective_list=_scatter_once(client, objective_list), verbose=verbose, timeout=timeout, pure=False, **objective_kwargs)
+
+        if verbose >= 6:
+            dask.distributed.progress(futures, notebook=False)
+
+        try:
+            if parallel_timeout is not None and np.isinf(parallel_timeout):
+                parallel_timeout = None
+            dask.distributed.wait(futures, timeout=parallel_timeout)
+        except dask.distributed.TimeoutError:
+            print("terminating parallel evaluation due to timeout")
+            pass
+
+        submitted_scores = []
+        # todo optimize this
+        for chunk, future in zip(chunks, futures):
+            if not future.done():
+                future.cancel()
+                submitted_scores.extend([["TIMEOUT"]]*len(chunk))
+                if verbose >= 4:
+                    for individual in chunk:
+                        print(f'WARNING AN INDIVIDUAL TIMED OUT: \n {individual} \n')
+            elif future.exception():
+                submitted_scores.extend([["INVALID"]]*len(chunk))
+                if verbose == 4:
+                    for individual in chunk:
+                        print(f'WARNING THIS INDIVIDUAL CAUSED AND EXCEPTION \n {individual} \n {future.exception()} \n')
+                if verbose >= 5:
+                    trace = traceback.format_exc()
+                    for individual in chunk:
+                        print(f'WARNING THIS INDIVIDUAL CAUSED AND EXCEPTION \n {individual} \n {future.exception()} \n {future.traceback()}')
+            else:
+                submitted_scores.extend(future.result())
+
+    if cache is not None:
+        #merge newly computed scores back in the original order. successful evaluations are cached,
+        #TIMEOUT/INVALID rows are kept for this call but not cached so they can be retried.
+        computed = {}
+        for i, score in zip(uncached_indexes, submitted_scores):
+            computed[keys[i]] = score
+            if not any(isinstance(s, str) for s in score):
+                cache[keys[i]] = score
+        offspring_scores = [cache[key] if key in cache else computed[key] for key in keys]
+    else:
+        offspring_scores = submitted_scores
 
     if n_expected_columns is not None:
-        offspring_scores = process_scores(offspring_scores, n_expected_columns)
+        #assemble one contiguous (n_individuals, n_objectives) matrix in place instead of a
+        #list of ragged rows, so downstream selection works on a 2-D array directly
+        out = np.empty((len(offspring_scores), n_expected_columns), dtype=object)
+        timeout_row = ("TIMEOUT",)*n_expected_columns
+        invalid_row = ("INVALID",)*n_expected_columns
+        for i, row in enumerate(offspring_scores):
+            if len(row) == n_expected_columns:
+                out[i, :] = row
+            elif "TIMEOUT" in row:
+                out[i, :] = timeout_row
+            else:
+                out[i, :] = invalid_row
+        offspring_scores = out
     return offspring_scores
 
 
@@ -137,19 +581,61 @@ def parallel_eval_objective_list(individual_list,
 # Parallel optimization
 #############
 
-@threading_timeoutable(np.nan) #TODO timeout behavior
-def optimize_objective(ind, objective, steps=5, verbose=0):
-    
-    with warnings.catch_warnings(record=True) as w:  #catches all warnings in w so it can be supressed by verbose                
+class _OptimizeTimedOut(BaseException):
+    #BaseException so it escapes the except Exception inside _optimize_objective,
+    #same trick func_timeout uses for FunctionTimedOut
+    pass
+
+def _raise_optimize_timeout(signum, frame):
+    raise _OptimizeTimedOut("optimize_objective timed out")
+
+def optimize_objective(ind, objective, steps=5, verbose=0, timeout=None):
+    '''
+    Runs _optimize_objective with an optional timeout, returning np.nan on timeout.
+    ind.optimize mutates the individual in place, so the work has to stay in this
+    process: on Unix main threads a SIGALRM itimer interrupts the optimization where
+    stopit's thread-based timeout could not; elsewhere (e.g. dask worker threads,
+    which cannot receive signals) the thread-based func_timeout is used instead.
+    '''
+    if timeout is None:
+        return _optimize_objective(ind, objective, steps=steps, verbose=verbose)
+
+    if hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread():
+        old_handler = signal.signal(signal.SIGALRM, _raise_optimize_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            return _optimize_objective(ind, objective, steps=steps, verbose=verbose)
+        except _OptimizeTimedOut:
+            return np.nan
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, old_handler)
+    else:
+        try:
+            return func_timeout.func_timeout(timeout, _optimize_objective, args=[ind, objective], kwargs={'steps':steps, 'verbose':verbose})
+        except func_timeout.exceptions.FunctionTimedOut:
+            return np.nan
+
+
+def _optimize_objective(ind, objective, steps=5, verbose=0):
+
+    if verbose >= 2:
+        warning_ctx = warnings.catch_warnings(record=True) #catches all warnings in w so they can be re-emitted
+    else:
+        warning_ctx = _quiet_warning_ctx()
+    with warning_ctx as w:
         try:
             value = ind.optimize(objective, steps=steps)
-            if not isinstance(value, Iterable):
-                value = [value]               
+            if isinstance(value, _SCALAR_TYPES):
+                value = (value,)
+            elif not hasattr(value, '__len__'):
+                value = [value]
 
             if len(w) and verbose>=2:
                 warnings.warn(w[0].message)
             return value
         except Exception as e:
+            logger.debug('individual raised during optimization: %r', ind, exc_info=True)
             if verbose >= 2:
                 print('WARNING THIS INDIVIDUAL CAUSED AND EXCEPTION')
                 print(e)
@@ -167,9 +653,13 @@ def parallel_optimize_objective(individual_list,
                                 verbose=0,
                                 steps=5,
                                 timeout=None,
+                                scheduler=None,
                                 **objective_kwargs,  ):
 
-    Parallel(n_jobs=n_jobs)(delayed(optimize_objective)(ind,  objective,  steps, verbose, timeout=timeout)  for ind in individual_list ) #TODO: parallelize
+    delayed_values = [dask.delayed(optimize_objective)(ind,  objective,  steps, verbose, timeout=timeout)  for ind in individual_list]
+    with TqdmCallback(desc="Optimizing Individuals", disable=verbose<2, leave=False):
+        #flat independent tasks, nothing for the graph optimizer to fuse
+        return list(dask.compute(*delayed_values, num_workers=n_jobs, threads_per_worker=1, optimize_graph=False, scheduler=scheduler))
 
 
 
@@ -1,6 +1,11 @@
 import numpy as np
 import random
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 def random_selector(scores,  k, n_parents=1,): 
     chosen = random.choices(list(range(0,len(scores))), k=k*n_parents)
@@ -171,6 +176,23 @@ def dominates(list1, list2):
     """
     return all(list1[i] >= list2[i] for i in range(len(list1))) and any(list1[i] > list2[i] for i in range(len(list1)))
 
+def _dominates_threshold(scores, thresholds, signs):
+    """
+    returns true if every weighted score is strictly better than its weighted threshold
+    scores, thresholds and signs must be 1-D float arrays of the same length
+    """
+    for i in range(scores.shape[0]):
+        #written as not(>) rather than <= so nan scores compare the same way as the
+        #original all([score*weight > threshold*weight]) check: nan never dominates
+        if not (scores[i]*signs[i] > thresholds[i]*signs[i]):
+            return False
+    return True
+
+#compile to a tight loop when numba is available, the python fallback is equivalent
+if njit is not None:
+    _dominates_threshold = njit(cache=True)(_dominates_threshold)
+
+
 #adapted from deap + gtp
 #bigger is better
 def crowding_distance(matrix):
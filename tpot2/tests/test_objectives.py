@@ -0,0 +1,119 @@
+import pytest
+import numpy as np
+import sklearn.linear_model
+from tpot2.objectives import parallel_eval_objective_list, eval_objective_list, _pipeline_key, _OBJ_CACHE
+
+
+class DummyIndividual():
+    #minimal individual with a structural unique_id, enough for the serial path
+    def __init__(self, uid):
+        self.uid = uid
+    def unique_id(self):
+        return self.uid
+
+
+class ExportingIndividual():
+    #individual whose unique_id falls back to identity, forcing _pipeline_key to
+    #hash the exported pipeline instead
+    def __init__(self, C):
+        self.C = C
+    def unique_id(self):
+        return self
+    def export_pipeline(self):
+        return sklearn.linear_model.LogisticRegression(C=self.C)
+
+
+@pytest.fixture(autouse=True)
+def clear_objective_cache():
+    #the per-process objective cache is keyed on (pipeline, objective, kwargs) and
+    #would otherwise leak results between tests
+    _OBJ_CACHE.clear()
+    yield
+    _OBJ_CACHE.clear()
+
+
+def test_pipeline_key_structural():
+    #structural unique_id is used directly
+    assert _pipeline_key(DummyIndividual('a')) == 'a'
+    #identity fallback hashes the exported pipeline: same hyperparameters share a key
+    assert _pipeline_key(ExportingIndividual(1.0)) == _pipeline_key(ExportingIndividual(1.0))
+    assert _pipeline_key(ExportingIndividual(1.0)) != _pipeline_key(ExportingIndividual(0.5))
+
+
+def test_parallel_eval_cache_dedup_and_merge_order():
+    cache = {}
+    calls = []
+    def score(ind):
+        calls.append(ind.uid)
+        return float(len(ind.uid))
+    individuals = [DummyIndividual('a'), DummyIndividual('bb'), DummyIndividual('a')]
+
+    scores = parallel_eval_objective_list(individuals, [score], n_jobs=1, cache=cache)
+    #duplicates are evaluated once but every row comes back, in the original order
+    assert calls == ['a', 'bb']
+    assert [s[0] for s in scores] == [1.0, 2.0, 1.0]
+
+    #second generation: everything is served from the cache
+    calls.clear()
+    scores = parallel_eval_objective_list(individuals, [score], n_jobs=1, cache=cache)
+    assert calls == []
+    assert [s[0] for s in scores] == [1.0, 2.0, 1.0]
+
+
+def test_failed_evaluations_are_retried():
+    cache = {}
+    attempts = []
+    def flaky(ind):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ValueError('transient failure')
+        return 1.0
+    individual = DummyIndividual('x')
+
+    scores = parallel_eval_objective_list([individual], [flaky], n_jobs=1, cache=cache)
+    assert list(scores[0]) == ['INVALID']
+    #failures are returned for this call but never cached, so they can be retried
+    assert cache == {}
+
+    scores = parallel_eval_objective_list([individual], [flaky], n_jobs=1, cache=cache)
+    assert scores[0][0] == 1.0
+    assert len(attempts) == 2
+
+
+def test_early_stop_thresholds_skip_remaining_objectives():
+    expensive_calls = []
+    def cheap(ind):
+        return 0.1
+    def expensive(ind):
+        expensive_calls.append(1)
+        return 0.9
+
+    #cheap objective falls below its threshold: the expensive one is never run and
+    #the remaining slots are filled with INVALID
+    row = eval_objective_list(DummyIndividual('pruned'), [cheap, expensive],
+                              early_stop_thresholds=[0.5, 0.5],
+                              objective_function_weights=[1, 1])
+    assert list(row) == [0.1, 'INVALID']
+    assert expensive_calls == []
+
+    #above the threshold every objective runs
+    row = eval_objective_list(DummyIndividual('kept'), [lambda ind: 0.9, expensive],
+                              early_stop_thresholds=[0.5, 0.5],
+                              objective_function_weights=[1, 1])
+    assert list(row) == [0.9, 0.9]
+    assert expensive_calls == [1]
+
+
+def test_n_expected_columns_returns_2d_matrix():
+    def pair(ind):
+        if ind.uid == 'bad':
+            raise ValueError('broken pipeline')
+        return [1.0, 2.0]
+    individuals = [DummyIndividual('ok'), DummyIndividual('bad')]
+
+    scores = parallel_eval_objective_list(individuals, [pair], n_jobs=1, n_expected_columns=2)
+    assert isinstance(scores, np.ndarray)
+    assert scores.shape == (2, 2)
+    assert list(scores[0]) == [1.0, 2.0]
+    #short failure rows are padded to the full width
+    assert list(scores[1]) == ['INVALID', 'INVALID']